@@ -2,14 +2,11 @@
 
 from __future__ import annotations
 
-import asyncio
 import importlib
-import json
 import logging
-import os
 from datetime import timedelta
-from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
 
 from homeassistant.components import frontend
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
@@ -35,6 +32,19 @@ from .const import (
     PANEL_URL_PATH,
 )
 
+try:
+    from .webui_runtime import simple_webui as _simple_webui  # type: ignore
+except ModuleNotFoundError:
+    _simple_webui = importlib.import_module("titon_controller_webui.simple_webui")  # type: ignore
+
+_REQUIRED_WEBUI_CALLABLES = (
+    "create_server",
+    "shutdown_server",
+    "snapshot_state",
+    "apply_level_strategy",
+    "turn_off_all_levels",
+)
+
 PLATFORMS: list[Platform] = [Platform.SELECT, Platform.SENSOR]
 
 _LOGGER = logging.getLogger(__name__)
@@ -44,23 +54,22 @@ def _prepare_sensor_payload(raw: Optional[Sequence[Dict[str, Any]]]) -> List[Lis
     if not raw:
         return []
 
-    prepared: List[List[str]] = []
-    for item in raw:
-        if not isinstance(item, dict):
-            continue
-        name = item.get("name")
-        entity_id = item.get("entity_id")
-        if not name or not entity_id:
-            continue
-        prepared.append([str(name), str(entity_id)])
-    return prepared
+    return [
+        [str(name), str(entity_id)]
+        for item in raw
+        if isinstance(item, dict)
+        for name, entity_id in ((item.get("name"), item.get("entity_id")),)
+        if name and entity_id
+    ]
 
 
 def _make_state_provider(hass: HomeAssistant):
-    loop = hass.loop
+    # The state machine is a plain dict lookup, so the web UI threads can read
+    # it directly instead of hopping onto the event loop for every sensor.
+    states_get = hass.states.get
 
-    async def _async_get(entity_id: str) -> Optional[float]:
-        state = hass.states.get(entity_id)
+    def _provider(entity_id: str) -> Optional[float]:
+        state = states_get(entity_id)
         if state is None:
             return None
         try:
@@ -68,14 +77,6 @@ def _make_state_provider(hass: HomeAssistant):
         except (TypeError, ValueError):
             return None
 
-    def _provider(entity_id: str) -> Optional[float]:
-        future = asyncio.run_coroutine_threadsafe(_async_get(entity_id), loop)
-        try:
-            return future.result(timeout=2)
-        except Exception as exc:  # pragma: no cover - defensive
-            _LOGGER.debug("Failed to resolve %s from HA state machine: %s", entity_id, exc)
-            return None
-
     return _provider
 
 
@@ -87,8 +88,6 @@ def _guess_panel_url(hass: HomeAssistant, host: str, port: int, explicit: Option
     if candidate in {"0.0.0.0", "127.0.0.1"}:
         internal_url = hass.config.internal_url
         if internal_url:
-            from urllib.parse import urlparse
-
             parsed = urlparse(internal_url)
             if parsed.hostname:
                 candidate = parsed.hostname
@@ -107,11 +106,28 @@ def _apply_state_provider(simple_webui, provider) -> None:
 class TitonControllerManager:
     """Runtime manager for the Titon controller web UI."""
 
+    __slots__ = (
+        "_hass",
+        "_entry",
+        "sensors",
+        "serial_port",
+        "web_host",
+        "web_port",
+        "settings_path",
+        "log_path",
+        "_explicit_panel_url",
+        "_panel_url",
+        "_server",
+        "_server_thread",
+        "_simple_webui",
+        "device_info",
+    )
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         self._hass = hass
         self._entry = entry
-        data = dict(entry.data)
-        options = dict(entry.options)
+        data = entry.data
+        options = entry.options
 
         sensors_raw = options.get(CONF_HUMIDITY_SENSORS)
         if sensors_raw is None:
@@ -123,7 +139,8 @@ class TitonControllerManager:
         self.web_port = int(data.get(CONF_WEB_PORT, DEFAULT_WEB_PORT))
         self.settings_path = data.get(CONF_SETTINGS_PATH) or hass.config.path("titon_controller_settings.json")
         self.log_path = data.get(CONF_LOG_PATH) or hass.config.path("titon_controller_webui.log")
-        self.panel_url = _guess_panel_url(hass, self.web_host, self.web_port, data.get(CONF_PANEL_URL))
+        self._explicit_panel_url = data.get(CONF_PANEL_URL)
+        self._panel_url: Optional[str] = None
 
         self._server = None
         self._server_thread = None
@@ -135,33 +152,27 @@ class TitonControllerManager:
             name="Titon Controller",
         )
 
-    def start(self) -> None:
-        os.environ["TITON_SERIAL_PORT"] = self.serial_port
-        os.environ["TITON_WEBUI_HOST"] = self.web_host
-        os.environ["TITON_WEBUI_PORT"] = str(self.web_port)
-        os.environ["TITON_SETTINGS_PATH"] = self.settings_path
-        os.environ["TITON_LOG_PATH"] = self.log_path
-        bundle_root = Path(__file__).parent / "webui_runtime"
-        os.environ["TITON_WEBUI_DIR"] = str(bundle_root / "webui")
-
-        settings_dir = Path(self.settings_path).parent
-        log_dir = Path(self.log_path).parent
-        settings_dir.mkdir(parents=True, exist_ok=True)
-        log_dir.mkdir(parents=True, exist_ok=True)
-
-        if self.sensors:
-            os.environ["TITON_SENSOR_ENTITIES"] = json.dumps(self.sensors)
-        else:
-            os.environ.pop("TITON_SENSOR_ENTITIES", None)
-
-        try:
-            from .webui_runtime import simple_webui  # type: ignore
-        except ModuleNotFoundError:
-            simple_webui = importlib.import_module("titon_controller_webui.simple_webui")  # type: ignore
+    @property
+    def panel_url(self) -> str:
+        if self._panel_url is None:
+            self._panel_url = _guess_panel_url(self._hass, self.web_host, self.web_port, self._explicit_panel_url)
+        return self._panel_url
 
-        self._simple_webui = simple_webui
-        _apply_state_provider(simple_webui, _make_state_provider(self._hass))
-        self._server, self._server_thread = simple_webui.create_server(host=self.web_host, port=self.web_port)
+    def start(self) -> None:
+        if self._server is not None:
+            _LOGGER.debug("Titon controller web UI already running; ignoring start()")
+            return
+
+        self._simple_webui = _simple_webui
+        _apply_state_provider(_simple_webui, _make_state_provider(self._hass))
+        self._server, self._server_thread = _simple_webui.create_server(
+            host=self.web_host,
+            port=self.web_port,
+            serial_port=self.serial_port,
+            settings_path=self.settings_path,
+            log_path=self.log_path,
+            sensors=self.sensors,
+        )
         _LOGGER.info(
             "Titon controller web UI started on http://%s:%s (settings=%s)",
             self.web_host,
@@ -170,16 +181,12 @@ class TitonControllerManager:
         )
 
     def stop(self) -> None:
-        simple_webui = self._simple_webui
-        if simple_webui is None:
-            try:
-                from .webui_runtime import simple_webui  # type: ignore
-            except ModuleNotFoundError:
-                simple_webui = importlib.import_module("titon_controller_webui.simple_webui")  # type: ignore
-        _apply_state_provider(simple_webui, None)
+        if self._server is None and self._simple_webui is None:
+            return
+        _apply_state_provider(_simple_webui, None)
         if self._server is not None:
             try:
-                simple_webui.shutdown_server(self._server)
+                _simple_webui.shutdown_server(self._server)
             finally:
                 self._server = None
         self._server_thread = None
@@ -258,6 +265,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Titon Controller from a config entry."""
 
     hass.data.setdefault(DOMAIN, {})
+    missing = [name for name in _REQUIRED_WEBUI_CALLABLES if not callable(getattr(_simple_webui, name, None))]
+    if missing:
+        _LOGGER.error("Titon web UI runtime %s is missing %s", _simple_webui.__name__, ", ".join(missing))
+        return False
+
     manager = TitonControllerManager(hass, entry)
     try:
         await hass.async_add_executor_job(manager.start)
@@ -281,17 +293,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         require_admin=False,
         update=True,
     )
+    entry.async_on_unload(lambda: frontend.async_remove_panel(hass, PANEL_URL_PATH))
 
     async def _async_on_stop(event) -> None:
         await hass.async_add_executor_job(manager.stop)
-        frontend.async_remove_panel(hass, PANEL_URL_PATH)
-
-    remove_stop = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_on_stop)
 
+    entry.async_on_unload(hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, _async_on_stop))
     entry.async_on_unload(entry.add_update_listener(_async_reload_entry))
     hass.data[DOMAIN][entry.entry_id] = {
         "manager": manager,
-        "remove_stop": remove_stop,
         "coordinator": coordinator,
     }
 
@@ -304,24 +314,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     stored = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
     manager: Optional[TitonControllerManager] = None
-    remove_stop = None
     if stored:
         manager = stored.get("manager")
-        remove_stop = stored.get("remove_stop")
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
-    if callable(remove_stop):
-        remove_stop()
-
     if manager:
         await hass.async_add_executor_job(manager.stop)
 
-    frontend.async_remove_panel(hass, PANEL_URL_PATH)
     return unload_ok
 
 
 async def _async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload the config entry when data or options change."""
 
-    await hass.config_entries.async_reload(entry.entry_id)
+    hass.config_entries.async_schedule_reload(entry.entry_id)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import voluptuous as vol
 
@@ -28,65 +28,50 @@ from .const import (
 TITLE = "Titon Controller"
 
 
-def _normalize_sensor_definitions(raw: Any) -> List[Dict[str, str]]:
-    sensors: List[Dict[str, str]] = []
+def _iter_sensor_pairs(raw: Any) -> Iterator[Tuple[Any, Any]]:
+    """Yield ``(name, entity_id)`` for each supported sensor definition shape."""
     if not raw:
-        return sensors
+        return
 
     for item in raw:
-        name: Optional[str] = None
-        entity_id: Optional[str] = None
-        if isinstance(item, dict):
-            name = item.get("name") or item.get("title")
-            entity_id = item.get("entity_id") or item.get("id")
+        if type(item) is dict or isinstance(item, dict):
+            yield item.get("name") or item.get("title"), item.get("entity_id") or item.get("id")
         elif isinstance(item, (list, tuple)) and len(item) == 2:
-            name, entity_id = item
+            yield item[0], item[1]
         elif isinstance(item, str):
-            name = item
-            entity_id = item
+            yield item, item
 
-        if not name or not entity_id:
-            continue
-        sensors.append({"name": str(name), "entity_id": str(entity_id)})
 
-    return sensors
+def _normalize_sensor_definitions(raw: Any) -> List[Dict[str, str]]:
+    return [
+        {"name": str(name), "entity_id": str(entity_id)}
+        for name, entity_id in _iter_sensor_pairs(raw)
+        if name and entity_id
+    ]
 
 
 def _extract_entity_ids(raw: Any) -> List[str]:
-    entity_ids: List[str] = []
-    if not raw:
-        return entity_ids
-
-    for item in raw:
-        if isinstance(item, dict) and item.get("entity_id"):
-            entity_ids.append(str(item["entity_id"]))
-        elif isinstance(item, (list, tuple)) and len(item) == 2:
-            entity_ids.append(str(item[1]))
-        elif isinstance(item, str):
-            entity_ids.append(item)
-    return entity_ids
+    return [str(entity_id) for _, entity_id in _iter_sensor_pairs(raw) if entity_id]
 
 
 async def _async_resolve_entities(hass: HomeAssistant, entity_ids: List[str]) -> List[Dict[str, str]]:
     if not entity_ids:
         return []
 
-    registry = er.async_get(hass)
+    registry_get = er.async_get(hass).async_get
+    states_get = hass.states.get
     resolved: List[Dict[str, str]] = []
 
     for entity_id in entity_ids:
         name: Optional[str] = None
-        if registry:
-            entry = registry.async_get(entity_id)
-            if entry:
-                name = entry.original_name or entry.name
+        entry = registry_get(entity_id)
+        if entry:
+            name = entry.original_name or entry.name
         if not name:
-            state = hass.states.get(entity_id)
+            state = states_get(entity_id)
             if state and state.name:
                 name = state.name
-        if not name:
-            name = entity_id
-        resolved.append({"name": name, "entity_id": entity_id})
+        resolved.append({"name": name or entity_id, "entity_id": entity_id})
 
     return resolved
 
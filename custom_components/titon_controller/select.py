@@ -6,7 +6,7 @@ from typing import Any
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -15,6 +15,11 @@ from .const import DOMAIN
 
 FAN_OPTIONS = ["Off", "Level 1", "Level 2", "Level 3", "Level 4"]
 
+# Indexed by fan level; index 0 is "Off".
+_LEVEL_TO_OPTION = tuple(FAN_OPTIONS)
+
+_EMPTY: dict[str, Any] = {}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -41,37 +46,42 @@ class TitonFanSpeedSelect(CoordinatorEntity, SelectEntity):
         self._attr_unique_id = f"{entry.entry_id}_fan_speed"
         self._attr_name = "Fan Speed"
         self._attr_device_info = manager.device_info
+        self._update_from_coordinator()
 
     @property
     def available(self) -> bool:
         return self._manager.is_running() and self.coordinator.last_update_success
 
-    @property
-    def current_option(self) -> str | None:
-        data = self.coordinator.data or {}
-        state = data.get("state") or {}
-        level = state.get("current_level")
-        if not level:
-            return "Off"
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_coordinator()
+        super()._handle_coordinator_update()
+
+    def _state(self) -> dict[str, Any]:
+        return (self.coordinator.data or _EMPTY).get("state") or _EMPTY
+
+    def _update_from_coordinator(self) -> None:
+        get = self._state().get
+        level = get("current_level")
+        self._attr_current_option = self._option_for_level(level)
+        self._attr_extra_state_attributes = {
+            "boost_active": get("boost_active"),
+            "manual_override_until": get("manual_override_until"),
+            "current_level": level,
+        }
+
+    @staticmethod
+    def _option_for_level(level: Any) -> str:
         try:
-            level_int = int(level)
+            level_int = int(level) if level else 0
         except (TypeError, ValueError):
-            return "Off"
-        level_int = max(1, min(4, level_int))
-        return f"Level {level_int}"
+            level_int = 0
+        if level_int:
+            level_int = max(1, min(4, level_int))
+        return _LEVEL_TO_OPTION[level_int]
 
     async def async_select_option(self, option: str) -> None:
         success = await self.hass.async_add_executor_job(self._manager.set_fan_speed, option)
         if not success:
             raise HomeAssistantError(f"Titon controller rejected fan speed '{option}'")
         await self.coordinator.async_request_refresh()
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        data = self.coordinator.data or {}
-        state = data.get("state") or {}
-        return {
-            "boost_active": state.get("boost_active"),
-            "manual_override_until": state.get("manual_override_until"),
-            "current_level": state.get("current_level"),
-        }
@@ -6,13 +6,15 @@ from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 
+_EMPTY: dict[str, Any] = {}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -38,25 +40,26 @@ class TitonErrorStatusSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{entry.entry_id}_error_status"
         self._attr_name = "Error Status"
         self._attr_device_info = manager.device_info
+        self._update_from_coordinator()
 
     @property
     def available(self) -> bool:
         return self._manager.is_running() and self.coordinator.last_update_success
 
-    @property
-    def native_value(self) -> str | None:
-        data = self.coordinator.data or {}
-        status = (data.get("state") or {}).get("status") or {}
-        flags = status.get("flags") or []
-        if not flags:
-            return "No errors reported"
-        return " / ".join(flags)
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_coordinator()
+        super()._handle_coordinator_update()
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        data = self.coordinator.data or {}
-        status = (data.get("state") or {}).get("status") or {}
-        return {
+    def _status(self) -> dict[str, Any]:
+        data = self.coordinator.data or _EMPTY
+        return (data.get("state") or _EMPTY).get("status") or _EMPTY
+
+    def _update_from_coordinator(self) -> None:
+        status = self._status()
+        flags = status.get("flags") or []
+        self._attr_native_value = " / ".join(flags) if flags else "No errors reported"
+        self._attr_extra_state_attributes = {
             "raw_status": status.get("raw"),
-            "flags": status.get("flags") or [],
+            "flags": flags,
         }
@@ -13,23 +13,59 @@ Modernised interface inspired by the GREE controller dashboard. Provides:
 
 from __future__ import annotations
 
+import atexit
 import json
 import math
 import os
 import threading
 import time
 from collections import defaultdict, deque
-from datetime import datetime, timedelta, time as dt_time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone, time as dt_time
+from functools import lru_cache
+from itertools import count, islice
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, BinaryIO, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import serial
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, render_template, request
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None  # type: ignore
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:  # pragma: no cover - handled at runtime
     requests = None  # type: ignore
+    HTTPAdapter = None  # type: ignore
+
+# ---------------------------------------------------------------------------
+# JSON helpers (orjson when available, stdlib json otherwise)
+# ---------------------------------------------------------------------------
+
+def _stdlib_dumps_bytes(obj: Any, pretty: bool = False) -> bytes:
+    if pretty:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+if orjson is not None:
+
+    def json_dumps_bytes(obj: Any, pretty: bool = False) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            # orjson rejects what stdlib json accepts (e.g. ints beyond 64 bits).
+            return _stdlib_dumps_bytes(obj, pretty)
+
+    json_loads = orjson.loads
+else:
+    json_dumps_bytes = _stdlib_dumps_bytes
+    json_loads = json.loads
 
 # ---------------------------------------------------------------------------
 # Paths & constants
@@ -37,6 +73,7 @@ except ImportError:  # pragma: no cover - handled at runtime
 
 PORT = os.environ.get("TITON_SERIAL_PORT", "/dev/ttyUSB1")
 BAUD = 1200
+SERIAL_REPLY_TIMEOUT = 2.0  # port read timeout; read_until() returns early on CRLF
 
 BASE_DIR = Path(__file__).resolve().parent
 DEFAULT_WEBUI_DIR = BASE_DIR / "webui"
@@ -51,8 +88,14 @@ try:
 except ValueError:
     WEB_PORT = 8050
 
+def ensure_dir(directory: Path) -> None:
+    # is_dir() is a single stat; mkdir(exist_ok=True) costs more when present.
+    if not directory.is_dir():
+        directory.mkdir(parents=True, exist_ok=True)
+
+
 for directory in (WEBUI_DIR, TEMPLATE_DIR, STATIC_DIR, LOG_PATH.parent, SETTINGS_PATH.parent):
-    directory.mkdir(parents=True, exist_ok=True)
+    ensure_dir(directory)
 
 # Sensor entities supplied by the user (title, entity_id)
 DEFAULT_SENSOR_ENTITIES: List[Tuple[str, str]] = [
@@ -63,23 +106,28 @@ DEFAULT_SENSOR_ENTITIES: List[Tuple[str, str]] = [
     ("Darbo kambarys", "sensor.darbo_kambarys_humidity"),
 ]
 
+
+def parse_sensor_entities(raw_entries: Any) -> List[Tuple[str, str]]:
+    parsed: List[Tuple[str, str]] = []
+    for item in raw_entries or []:
+        if isinstance(item, (list, tuple)) and len(item) == 2:
+            parsed.append((str(item[0]), str(item[1])))
+        elif isinstance(item, dict) and "name" in item and "entity_id" in item:
+            parsed.append((str(item["name"]), str(item["entity_id"])))
+    return parsed
+
+
 SENSOR_ENTITIES: List[Tuple[str, str]] = DEFAULT_SENSOR_ENTITIES.copy()
 ENV_SENSOR_CONFIG = os.environ.get("TITON_SENSOR_ENTITIES")
 if ENV_SENSOR_CONFIG:
     try:
-        raw_entries = json.loads(ENV_SENSOR_CONFIG)
-        parsed: List[Tuple[str, str]] = []
-        for item in raw_entries:
-            if isinstance(item, (list, tuple)) and len(item) == 2:
-                parsed.append((str(item[0]), str(item[1])))
-            elif isinstance(item, dict) and "name" in item and "entity_id" in item:
-                parsed.append((str(item["name"]), str(item["entity_id"])))
+        parsed = parse_sensor_entities(json_loads(ENV_SENSOR_CONFIG))
         if parsed:
             SENSOR_ENTITIES = parsed
     except Exception:
         pass
 
-SENSOR_IDS = [entity for _, entity in SENSOR_ENTITIES]
+SENSOR_IDS = tuple(entity for _, entity in SENSOR_ENTITIES)
 
 DEFAULT_TARGET = 55.0
 
@@ -113,12 +161,57 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
 # Settings persistence
 # ---------------------------------------------------------------------------
 
+SETTINGS_FLUSH_INTERVAL = 2.0  # seconds to coalesce settings writes
+PRETTY_SETTINGS = bool(os.environ.get("TITON_PRETTY_SETTINGS"))
+
+# Writers hold settings_lock/state_lock; single-key reads (and dict(...) copies
+# of one section) are atomic under the GIL and skip the lock entirely.
 settings_lock = threading.Lock()
+_settings_write_lock = threading.Lock()
+_settings_dirty = threading.Event()
+
+
+_state_versions = count(1)
+_state_version = 0
+
+
+def utc_timestamp() -> str:
+    """Second-resolution UTC timestamp with an explicit offset for the browser."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def touch_state() -> None:
+    """Mark state/settings as changed so cached status payloads are rebuilt."""
+    global _state_version
+    _state_version = next(_state_versions)
+
+
+def clone_tree(value: Any) -> Any:
+    """Copy nested dicts/lists of JSON primitives (cheaper than a JSON round-trip)."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: clone_tree(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [clone_tree(item) for item in value]
+    return value
+
+
+def readonly_settings_view() -> Mapping[str, Any]:
+    """Point-in-time, read-only view of settings for templates. Hold settings_lock.
+
+    Settings are only two levels deep, so copying each section is a full
+    snapshot without a JSON round-trip.
+    """
+    return MappingProxyType(
+        {
+            key: MappingProxyType(dict(value)) if isinstance(value, dict) else value
+            for key, value in settings.items()
+        }
+    )
 
 
 def ensure_setting_structure(data: Dict[str, Any]) -> Dict[str, Any]:
     """Merge stored settings with defaults to keep backward compatibility."""
-    merged = json.loads(json.dumps(DEFAULT_SETTINGS))
+    merged = clone_tree(DEFAULT_SETTINGS)
     for key, value in data.items():
         if isinstance(value, dict) and key in merged:
             merged[key].update(value)
@@ -136,22 +229,55 @@ def ensure_setting_structure(data: Dict[str, Any]) -> Dict[str, Any]:
 def load_settings() -> Dict[str, Any]:
     if SETTINGS_PATH.exists():
         try:
-            with SETTINGS_PATH.open("r", encoding="utf-8") as fh:
-                data = json.load(fh)
+            data = json_loads(SETTINGS_PATH.read_bytes())
             return ensure_setting_structure(data)
         except Exception as exc:  # pragma: no cover - defensive
             print(f"⚠️ Failed to load settings ({exc}), reverting to defaults")
-    return json.loads(json.dumps(DEFAULT_SETTINGS))
+    return clone_tree(DEFAULT_SETTINGS)
 
 
 def save_settings() -> None:
-    with settings_lock:
-        SETTINGS_PATH.write_text(json.dumps(settings, indent=2), encoding="utf-8")
+    """Mark settings dirty; settings_flush_loop persists them shortly after.
+
+    Safe to call with settings_lock held: nothing is written here.
+    """
+    touch_state()
+    _settings_dirty.set()
+
+
+def flush_settings() -> None:
+    """Atomically write settings to SETTINGS_PATH if they changed."""
+    with _settings_write_lock:
+        if not _settings_dirty.is_set():
+            return
+        _settings_dirty.clear()
+        tmp_path = SETTINGS_PATH.with_suffix(SETTINGS_PATH.suffix + ".tmp")
+        try:
+            with settings_lock:
+                payload = json_dumps_bytes(settings, pretty=PRETTY_SETTINGS)
+            tmp_path.write_bytes(payload)
+            tmp_path.replace(SETTINGS_PATH)
+        except Exception as exc:  # pragma: no cover - defensive
+            _settings_dirty.set()
+            print(f"⚠️ Failed to save settings ({exc}), will retry")
+
+
+def settings_flush_loop() -> None:
+    while True:
+        _settings_dirty.wait()
+        # Coalesce bursts of UI changes into a single write.
+        time.sleep(SETTINGS_FLUSH_INTERVAL)
+        try:
+            flush_settings()
+        except Exception as exc:  # pragma: no cover - defensive
+            print(f"⚠️ Settings flush failed ({exc})")
 
 
 settings = load_settings()
 if not SETTINGS_PATH.exists():
     save_settings()
+    flush_settings()
+atexit.register(flush_settings)
 
 # ---------------------------------------------------------------------------
 # Flask application initialisation
@@ -208,27 +334,70 @@ state: Dict[str, Any] = {
         "reason": None,
         "last_learning_update": None,
     },
-    "ha_humidity": {},
+    # Replaced wholesale (never mutated) so readers can use the reference as-is.
+    "ha_humidity": MappingProxyType({}),
     "learning": {
-        "offsets": {entity: 0.0 for entity in SENSOR_IDS},
+        "offsets": MappingProxyType({entity: 0.0 for entity in SENSOR_IDS}),
     },
 }
 
 history_buffer: deque = deque(maxlen=1440)  # ≈24h @ 60s sampling
 log_buffer: deque = deque(maxlen=500)
+history_counts: Dict[str, int] = {"valid": 0, "within": 0}
+
+
+class RollingMean:
+    """Fixed-size sliding window with an O(1) running mean."""
+
+    __slots__ = ("_buf", "_sum")
+
+    def __init__(self, maxlen: int) -> None:
+        self._buf: deque = deque(maxlen=maxlen)
+        self._sum = 0.0
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    @property
+    def maxlen(self) -> int:
+        return self._buf.maxlen  # type: ignore[return-value]
+
+    def push(self, value: float) -> None:
+        if len(self._buf) == self._buf.maxlen:
+            self._sum -= self._buf[0]
+        self._buf.append(value)
+        self._sum += value
+
+    def mean(self) -> float:
+        return self._sum / len(self._buf)
+
 
 auto_state: Dict[str, Any] = {
-    "diff_buffers": {entity: deque(maxlen=settings["learning"]["sample_window"]) for entity in SENSOR_IDS},
+    "diff_buffers": {entity: RollingMean(settings["learning"]["sample_window"]) for entity in SENSOR_IDS},
 }
 
+HA_FETCH_WORKERS = 8
+
 ha_session = requests.Session() if requests else None  # type: ignore
+if ha_session is not None:
+    _ha_adapter = HTTPAdapter(pool_connections=2, pool_maxsize=HA_FETCH_WORKERS, max_retries=0)
+    ha_session.mount("http://", _ha_adapter)
+    ha_session.mount("https://", _ha_adapter)
+_ha_pool = ThreadPoolExecutor(max_workers=HA_FETCH_WORKERS, thread_name_prefix="titon-ha") if ha_session else None
 HA_STATE_PROVIDER: Optional[Callable[[str], Optional[float]]] = None
 
 # ---------------------------------------------------------------------------
 # Logging utilities
 # ---------------------------------------------------------------------------
 
+LOG_FLUSH_INTERVAL = 2.0  # seconds between batched log file writes
+LOG_PENDING_LIMIT = 10000  # oldest unwritten entries are dropped beyond this
+
 log_lock = threading.Lock()
+_log_write_lock = threading.Lock()
+_pending_logs: deque = deque(maxlen=LOG_PENDING_LIMIT)
+_log_file: Optional[BinaryIO] = None
+_log_file_path: Optional[Path] = None
 
 
 def append_log(kind: str, message: str, meta: Optional[Dict[str, Any]] = None) -> None:
@@ -240,34 +409,72 @@ def append_log(kind: str, message: str, meta: Optional[Dict[str, Any]] = None) -
     }
     with log_lock:
         log_buffer.appendleft(entry)
+        _pending_logs.append(entry)
+
+
+def flush_logs() -> None:
+    """Write pending log entries to LOG_PATH through a long-lived handle."""
+    global _log_file, _log_file_path
+    with _log_write_lock:
+        with log_lock:
+            if not _pending_logs:
+                return
+            pending = list(_pending_logs)
+            _pending_logs.clear()
         try:
-            with LOG_PATH.open("a", encoding="utf-8") as fh:
-                fh.write(json.dumps(entry) + "\n")
+            if _log_file is None or _log_file_path != LOG_PATH:
+                if _log_file is not None:
+                    _log_file.close()
+                _log_file = LOG_PATH.open("ab", buffering=1 << 16)
+                _log_file_path = LOG_PATH
+            _log_file.writelines(json_dumps_bytes(entry) + b"\n" for entry in pending)
+            _log_file.flush()
         except Exception:
-            pass
+            _log_file = None
+
+
+def log_flush_loop() -> None:
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        flush_logs()
+
+
+atexit.register(flush_logs)
+
+
+def _count_history_entry(entry: Dict[str, Any], step: int) -> None:
+    max_delta = entry.get("max_delta")
+    if max_delta is None:
+        return
+    history_counts["valid"] += step
+    if max_delta <= 0:
+        history_counts["within"] += step
 
 
 def record_history(entry: Dict[str, Any]) -> None:
+    # Keep running counts in step with the bounded deque so the
+    # time-in-range metric is O(1) per sample.
+    if len(history_buffer) == history_buffer.maxlen:
+        _count_history_entry(history_buffer[0], -1)
     history_buffer.append(entry)
-    # Update performance metric (time in range)
-    valid_entries = [h for h in history_buffer if h.get("max_delta") is not None]
-    if valid_entries:
-        within = sum(1 for h in valid_entries if h["max_delta"] <= 0)
-        pct = round(within / len(valid_entries) * 100, 1)
-    else:
-        pct = None
+    _count_history_entry(entry, 1)
+
+    valid = history_counts["valid"]
+    pct = round(history_counts["within"] / valid * 100, 1) if valid else None
     with state_lock:
+        touch_state()
         state["metrics"]["time_in_range_pct"] = pct
 
 
 def snapshot_state() -> Dict[str, Any]:
     with state_lock:
-        data = json.loads(json.dumps(state))
-    with settings_lock:
-        data["settings"] = settings
+        data = clone_tree(state)
+    # Encoded by the caller; binding the reference needs no lock.
+    data["settings"] = settings
     return data
 
 
+@lru_cache(maxsize=16)
 def parse_time(value: str) -> dt_time:
     hour, minute = value.split(":")
     return dt_time(hour=int(hour), minute=int(minute))
@@ -291,13 +498,15 @@ def is_within_quiet_hours(now: Optional[datetime] = None) -> bool:
 
 def enforce_night_quiet(level: int) -> Tuple[int, bool]:
     quiet_max = settings["night_quiet"].get("max_level", 2)
-    if is_within_quiet_hours():
-        capped = min(level, int(quiet_max))
+    active = is_within_quiet_hours()
+    # Single-key dict reads are atomic; only take the lock to flip the flag.
+    if state["night_quiet_active"] != active:
         with state_lock:
-            state["night_quiet_active"] = True
+            touch_state()
+            state["night_quiet_active"] = active
+    if active:
+        capped = min(level, int(quiet_max))
         return capped, capped != level
-    with state_lock:
-        state["night_quiet_active"] = False
     return level, False
 
 
@@ -305,36 +514,52 @@ def schedule_manual_override() -> None:
     minutes = max(1, int(settings["auto_mode"].get("override_minutes", 10)))
     expiry = time.time() + minutes * 60
     with state_lock:
+        touch_state()
         state["manual_override_until"] = expiry
     append_log("mode", f"Manual override active for {minutes} min", {"until": expiry})
 
 
 def manual_override_active() -> Tuple[bool, Optional[float]]:
+    now = time.time()
+    expiry = state["manual_override_until"]
+    if not expiry:
+        return False, None
+    if expiry > now:
+        return True, expiry - now
+
     with state_lock:
-        expiry = state.get("manual_override_until")
-    if expiry and expiry > time.time():
-        return True, expiry - time.time()
-    if expiry and expiry <= time.time():
-        with state_lock:
+        current = state["manual_override_until"]
+        if current == expiry:
+            touch_state()
             state["manual_override_until"] = None
+    if current and current != expiry:
+        # A fresh override was scheduled while we were checking.
+        return True, current - now
+    if current == expiry:
         append_log("mode", "Manual override window expired; auto mode resumes")
     return False, None
 
 
-def update_metrics_from_humidity(humidity_map: Dict[str, Optional[float]]) -> Dict[str, Any]:
+def humidity_deltas(humidity_map: Mapping[str, Optional[float]]) -> List[Tuple[str, float]]:
+    """Return ``(entity, reading - (target + learned offset))`` for each reporting sensor."""
+    reading_get = humidity_map.get
+    target_get = settings["humidity_targets"].get
+    offset_get = state["learning"]["offsets"].get
+    return [
+        (entity, value - (target_get(entity, DEFAULT_TARGET) + offset_get(entity, 0.0)))
+        for entity in SENSOR_IDS
+        if (value := reading_get(entity)) is not None
+    ]
+
+
+def update_metrics_from_humidity(humidity_map: Mapping[str, Optional[float]]) -> Dict[str, Any]:
     valid_values = [v for v in humidity_map.values() if isinstance(v, (int, float))]
     if not valid_values:
         metrics = {"avg_humidity": None, "max_humidity": None, "avg_delta": None, "max_delta": None}
     else:
         avg = sum(valid_values) / len(valid_values)
         mx = max(valid_values)
-        deltas = []
-        for entity, val in humidity_map.items():
-            if val is None:
-                continue
-            target = settings["humidity_targets"].get(entity, DEFAULT_TARGET)
-            offset = state["learning"]["offsets"].get(entity, 0.0)
-            deltas.append(val - (target + offset))
+        deltas = [delta for _, delta in humidity_deltas(humidity_map)]
         avg_delta = sum(deltas) / len(deltas) if deltas else None
         max_delta = max(deltas) if deltas else None
         metrics = {
@@ -344,6 +569,7 @@ def update_metrics_from_humidity(humidity_map: Dict[str, Optional[float]]) -> Di
             "max_delta": round(max_delta, 2) if max_delta is not None else None,
         }
     with state_lock:
+        touch_state()
         state["metrics"].update(metrics)
     return metrics
 
@@ -352,13 +578,64 @@ def update_metrics_from_humidity(humidity_map: Dict[str, Optional[float]]) -> Di
 # Serial helpers (re-using previous proven logic)
 # ---------------------------------------------------------------------------
 
+# Re-entrant so send_command() can retry while already holding the port.
+serial_lock = threading.RLock()
+_serial_port: Optional[serial.Serial] = None
+
+
+def get_serial_port() -> serial.Serial:
+    """Return the shared port handle, reopening it if needed. Hold serial_lock."""
+    global _serial_port
+    ser = _serial_port
+    if ser is None or not ser.is_open or ser.port != PORT:
+        if ser is not None:
+            try:
+                ser.close()
+            except Exception:
+                pass
+        ser = serial.Serial(PORT, BAUD, timeout=SERIAL_REPLY_TIMEOUT)
+        _serial_port = ser
+    return ser
+
+
+SENSOR_REGISTERS = ("030", "031", "032", "036", "060", "061")
+CONTROL_REGISTERS = ("041", "042", "043", "044", "045", "054", "151", "152", "154", "326")
+
+# Pre-encoded frames for the registers we talk to routinely.
+_READ_QUERIES = {addr: f"{addr}1xxxxxx\r\n".encode("ascii") for addr in SENSOR_REGISTERS}
+_WRITE_PREFIXES = {addr: f"{addr}0+".encode("ascii") for addr in CONTROL_REGISTERS}
+
+
+def encode_read_query(addr: str) -> bytes:
+    query = _READ_QUERIES.get(addr)
+    return query if query is not None else f"{addr}1xxxxxx\r\n".encode("ascii")
+
+
+def encode_write_command(addr: str, val: int) -> bytes:
+    prefix = _WRITE_PREFIXES.get(addr)
+    if prefix is None:
+        prefix = f"{addr}0+".encode("ascii")
+    return prefix + b"%05d\r\n" % val
+
+
+def close_serial_port() -> None:
+    global _serial_port
+    with serial_lock:
+        if _serial_port is not None:
+            try:
+                _serial_port.close()
+            except Exception:
+                pass
+            _serial_port = None
+
 
 def enable_titon_remote_control() -> bool:
     print("\n" + "=" * 70)
     print("🔧 ENABLING TITON REMOTE CONTROL")
     print("=" * 70)
     try:
-        with serial.Serial(PORT, BAUD, timeout=2) as ser:
+        with serial_lock:
+            ser = get_serial_port()
             commands = [
                 ("041", 0, "Operating Mode = 0"),
                 ("043", 1, "Auto/Manual = 1"),
@@ -367,13 +644,12 @@ def enable_titon_remote_control() -> bool:
                 ("054", 1, "Control Authority = 1"),
             ]
             for addr, val, label in commands:
-                cmd = f"{addr}0+{val:05d}\r\n"
                 ser.reset_input_buffer()
                 ser.reset_output_buffer()
-                time.sleep(0.1)
-                ser.write(cmd.encode("ascii"))
+                ser.write(encode_write_command(addr, val))
                 ser.flush()
-                time.sleep(0.3)
+                # Returns on the controller's acknowledgement or after the port timeout.
+                ser.read_until(b"\r\n", size=32)
                 print(f"  ✓ {label}")
         print("=" * 70)
         print("✅ REMOTE CONTROL ENABLED")
@@ -381,6 +657,7 @@ def enable_titon_remote_control() -> bool:
         append_log("system", "Remote control enabled")
         return True
     except Exception as exc:
+        close_serial_port()
         print(f"❌ Failed to enable remote control: {exc}\n")
         append_log("error", "Failed to enable remote control", {"error": str(exc)})
         return False
@@ -410,19 +687,17 @@ def send_command(addr: str, val: int, retry: int = 0) -> bool:
     print(prefix if retry == 0 else f"{prefix} (RETRY #{retry})")
     print("=" * 70)
     try:
-        with serial.Serial(PORT, BAUD, timeout=2) as ser:
-            cmd = f"{addr}0+{val:05d}\r\n"
-            cmd_bytes = cmd.encode("ascii")
+        with serial_lock:
+            ser = get_serial_port()
+            cmd_bytes = encode_write_command(addr, val)
             if addr in {"151", "152", "154", "045"}:
                 wait_for_quiet_period(ser, max_wait=10.0)
             ser.reset_input_buffer()
             ser.reset_output_buffer()
-            time.sleep(0.1)
             bytes_written = ser.write(cmd_bytes)
             ser.flush()
             print(f"[{timestamp}] → Sent {bytes_written}/{len(cmd_bytes)} bytes to register {addr}")
-            time.sleep(0.5)
-            resp = ser.read(ser.in_waiting if ser.in_waiting > 0 else 32)
+            resp = ser.read_until(b"\r\n", size=32)
             if resp:
                 decoded = resp.decode("ascii", errors="replace")
                 parsed_reg = decoded[0:3] if len(decoded) >= 3 else None
@@ -434,12 +709,14 @@ def send_command(addr: str, val: int, retry: int = 0) -> bool:
                     time.sleep(1)
                     return send_command(addr, val, retry=retry + 1)
         with state_lock:
+            touch_state()
             state["last_command"] = f"{addr}={val}"
             state["last_command_time"] = datetime.utcnow().isoformat()
         print(f"[{timestamp}] ✅ Command complete")
         print("=" * 70)
         return True
     except Exception as exc:
+        close_serial_port()
         print(f"[{timestamp}] ❌ ERROR: {exc}")
         append_log("error", "Serial command failed", {"register": addr, "value": val, "error": str(exc)})
         return False
@@ -449,40 +726,44 @@ def apply_boost_inhibit(enabled: bool) -> bool:
     target_val = 1 if enabled else 0
     if send_command("326", target_val):
         with state_lock:
+            touch_state()
             state["boost_inhibit"] = enabled
         return True
     return False
 
 
+# Register writes per fan level, sent in order with a short pause between.
+LEVEL_STRATEGIES: Dict[int, Tuple[Tuple[str, int, str], ...]] = {
+    1: (
+        ("154", 0, "Speed 4 OFF"),
+        ("152", 0, "Speed 3 OFF"),
+        ("151", 0, "Speed 1 OFF"),
+        ("326", 1, "Boost Inhibit ON (block Speed 3/4)"),
+        ("151", 1, "Speed 1 ON"),
+    ),
+    2: (
+        ("154", 0, "Speed 4 OFF"),
+        ("152", 0, "Speed 3 OFF"),
+        ("151", 0, "Speed 1 OFF"),
+        ("326", 1, "Boost Inhibit ON (hold default Speed 2)"),
+    ),
+    3: (
+        ("326", 0, "Boost Inhibit OFF"),
+        ("154", 0, "Speed 4 OFF"),
+        ("151", 0, "Speed 1 OFF"),
+        ("152", 1, "Speed 3 ON"),
+    ),
+    4: (
+        ("326", 0, "Boost Inhibit OFF"),
+        ("152", 0, "Speed 3 OFF"),
+        ("151", 0, "Speed 1 OFF"),
+        ("154", 1, "Speed 4 ON"),
+    ),
+}
+
+
 def apply_level_strategy(level: int) -> bool:
-    strategies = {
-        1: [
-            ("154", 0, "Speed 4 OFF"),
-            ("152", 0, "Speed 3 OFF"),
-            ("151", 0, "Speed 1 OFF"),
-            ("326", 1, "Boost Inhibit ON (block Speed 3/4)"),
-            ("151", 1, "Speed 1 ON"),
-        ],
-        2: [
-            ("154", 0, "Speed 4 OFF"),
-            ("152", 0, "Speed 3 OFF"),
-            ("151", 0, "Speed 1 OFF"),
-            ("326", 1, "Boost Inhibit ON (hold default Speed 2)"),
-        ],
-        3: [
-            ("326", 0, "Boost Inhibit OFF"),
-            ("154", 0, "Speed 4 OFF"),
-            ("151", 0, "Speed 1 OFF"),
-            ("152", 1, "Speed 3 ON"),
-        ],
-        4: [
-            ("326", 0, "Boost Inhibit OFF"),
-            ("152", 0, "Speed 3 OFF"),
-            ("151", 0, "Speed 1 OFF"),
-            ("154", 1, "Speed 4 ON"),
-        ],
-    }
-    steps = strategies.get(level)
+    steps = LEVEL_STRATEGIES.get(level)
     if not steps:
         append_log("error", f"Invalid strategy requested for level {level}")
         return False
@@ -493,28 +774,33 @@ def apply_level_strategy(level: int) -> bool:
             return False
         time.sleep(0.2)
 
+    started = utc_timestamp()
     with state_lock:
+        touch_state()
         state["boost_inhibit"] = level in (1, 2)
         state["boost_active"] = level == 4
         state["current_level"] = level
-        state["level_start_time"] = datetime.utcnow().isoformat()
+        state["level_start_time"] = started
     append_log("control", f"Level {level} applied", {"strategy": True})
     return True
 
 
+OFF_SEQUENCE: Tuple[Tuple[str, int, str], ...] = (
+    ("151", 0, "Speed 1 OFF"),
+    ("152", 0, "Speed 3 OFF"),
+    ("154", 0, "Speed 4 OFF"),
+    ("326", 0, "Boost Inhibit OFF"),
+)
+
+
 def turn_off_all_levels() -> bool:
-    steps = [
-        ("151", 0, "Speed 1 OFF"),
-        ("152", 0, "Speed 3 OFF"),
-        ("154", 0, "Speed 4 OFF"),
-        ("326", 0, "Boost Inhibit OFF"),
-    ]
-    for addr, val, label in steps:
+    for addr, val, label in OFF_SEQUENCE:
         if not send_command(addr, val):
             append_log("error", "Turn off step failed", {"step": label})
             return False
         time.sleep(0.2)
     with state_lock:
+        touch_state()
         state["current_level"] = None
         state["boost_active"] = False
         state["boost_inhibit"] = False
@@ -523,26 +809,40 @@ def turn_off_all_levels() -> bool:
     return True
 
 
-def read_sensor(addr: str) -> Optional[int]:
+def read_sensors_batch(addrs: Sequence[str], reply_timeout: float = 2.5) -> Dict[str, Optional[int]]:
+    """Query several registers in one serial session.
+
+    Queries still go out one at a time (the RS-485 bus is half-duplex), but
+    each reply is read as soon as its line terminator arrives instead of
+    after a fixed sleep, and the port is held for the whole exchange.
+    """
+    results: Dict[str, Optional[int]] = {addr: None for addr in addrs}
     try:
-        with serial.Serial(PORT, BAUD, timeout=2) as ser:
+        with serial_lock:
+            ser = get_serial_port()
             ser.reset_input_buffer()
-            cmd = f"{addr}1xxxxxx\r\n"
-            ser.write(cmd.encode("ascii"))
-            ser.flush()
-            time.sleep(0.5)
-            resp = ser.read(ser.in_waiting if ser.in_waiting > 0 else 32)
-            if resp:
-                decoded = resp.decode("ascii", errors="replace")
-                for token in decoded.split("\r\n"):
-                    if len(token) >= 9 and token[:3].isdigit():
+            for addr in addrs:
+                ser.write(encode_read_query(addr))
+                ser.flush()
+                deadline = time.monotonic() + reply_timeout
+                while time.monotonic() < deadline:
+                    line = ser.read_until(b"\r\n")
+                    if not line:
+                        break
+                    token = line.decode("ascii", errors="replace").strip()
+                    if len(token) >= 9 and token[:3] == addr:
                         try:
-                            return int(token[4:9])
+                            results[addr] = int(token[4:9])
                         except ValueError:
                             continue
+                        break
     except Exception:
-        pass
-    return None
+        close_serial_port()
+    return results
+
+
+def read_sensor(addr: str) -> Optional[int]:
+    return read_sensors_batch((addr,))[addr]
 
 
 STATUS_FLAGS = [
@@ -565,8 +865,19 @@ STATUS_FLAGS = [
 ]
 
 
+# Flag label per bit position; every STATUS_FLAGS bit is a power of two.
+_FLAG_BY_POSITION = {bit.bit_length() - 1: label for bit, label in STATUS_FLAGS}
+_STATUS_MASK = sum(bit for bit, _ in STATUS_FLAGS)
+
+
 def decode_status_word(value: int) -> List[str]:
-    flags = [label for bit, label in STATUS_FLAGS if value & bit]
+    # Walk only the set bits, lowest first (same order as STATUS_FLAGS).
+    flags: List[str] = []
+    remaining = value & _STATUS_MASK
+    while remaining:
+        lowest = remaining & -remaining
+        flags.append(_FLAG_BY_POSITION[lowest.bit_length() - 1])
+        remaining ^= lowest
     return flags or ["No errors reported"]
 
 
@@ -578,13 +889,15 @@ def decode_status_word(value: int) -> List[str]:
 def update_sensors_loop() -> None:
     while True:
         try:
-            indoor = read_sensor("030")
-            outdoor = read_sensor("031")
-            fresh = read_sensor("032")
-            humidity = read_sensor("036")
-            runtime = read_sensor("060")
-            status_word = read_sensor("061")
+            readings = read_sensors_batch(SENSOR_REGISTERS)
+            indoor = readings["030"]
+            outdoor = readings["031"]
+            fresh = readings["032"]
+            humidity = readings["036"]
+            runtime = readings["060"]
+            status_word = readings["061"]
             with state_lock:
+                touch_state()
                 if indoor is not None:
                     state["sensors"]["indoor_temp"] = indoor / 10
                 if outdoor is not None:
@@ -603,6 +916,58 @@ def update_sensors_loop() -> None:
         time.sleep(60)
 
 
+def configure_runtime(
+    *,
+    serial_port: Optional[str] = None,
+    settings_path: Optional[str] = None,
+    log_path: Optional[str] = None,
+    sensors: Optional[List[Any]] = None,
+) -> None:
+    """Apply configuration handed over by the integration.
+
+    The ``TITON_*`` environment variables are only read once at import time;
+    this lets the Home Assistant integration pass its config entry values
+    directly, including on reloads after the module is already loaded.
+    """
+    global PORT, LOG_PATH, SETTINGS_PATH, SENSOR_ENTITIES, SENSOR_IDS, settings
+
+    if serial_port:
+        PORT = serial_port
+    if log_path:
+        LOG_PATH = Path(log_path)
+        ensure_dir(LOG_PATH.parent)
+    if sensors is not None:
+        SENSOR_ENTITIES = parse_sensor_entities(sensors) or DEFAULT_SENSOR_ENTITIES.copy()
+        SENSOR_IDS = tuple(entity for _, entity in SENSOR_ENTITIES)
+        DEFAULT_SETTINGS["humidity_targets"] = {entity: DEFAULT_TARGET for entity in SENSOR_IDS}
+    if settings_path:
+        flush_settings()
+        SETTINGS_PATH = Path(settings_path)
+        ensure_dir(SETTINGS_PATH.parent)
+    if not settings_path and sensors is None:
+        return
+
+    loaded = load_settings()
+    with settings_lock:
+        settings = loaded
+    if not SETTINGS_PATH.exists():
+        save_settings()
+        flush_settings()
+
+    with state_lock:
+        touch_state()
+        state["auto_enabled"] = loaded["auto_mode"]["enabled"]
+        state["night_quiet_enabled"] = loaded["night_quiet"]["enabled"]
+        offsets = state["learning"]["offsets"]
+        state["learning"]["offsets"] = MappingProxyType({entity: offsets.get(entity, 0.0) for entity in SENSOR_IDS})
+
+    window = loaded["learning"]["sample_window"]
+    buffers = auto_state["diff_buffers"]
+    auto_state["diff_buffers"] = {
+        entity: buffers.get(entity) or RollingMean(window) for entity in SENSOR_IDS
+    }
+
+
 def set_ha_state_provider(provider: Optional[Callable[[str], Optional[float]]]) -> None:
     """Inject a callback that resolves Home Assistant sensor states."""
     global HA_STATE_PROVIDER
@@ -612,7 +977,7 @@ def set_ha_state_provider(provider: Optional[Callable[[str], Optional[float]]])
 def fetch_home_assistant_humidity() -> Dict[str, Optional[float]]:
     if HA_STATE_PROVIDER:
         results: Dict[str, Optional[float]] = {}
-        for _, entity in SENSOR_ENTITIES:
+        for entity in SENSOR_IDS:
             try:
                 results[entity] = HA_STATE_PROVIDER(entity)
             except Exception as exc:  # pragma: no cover - defensive
@@ -623,8 +988,7 @@ def fetch_home_assistant_humidity() -> Dict[str, Optional[float]]:
     if requests is None or not ha_session:
         return {}
 
-    with settings_lock:
-        ha_cfg = dict(settings["ha"])
+    ha_cfg = dict(settings["ha"])
     base_url = ha_cfg.get("url", "").rstrip("/")
     token = ha_cfg.get("token", "").strip()
     timeout = float(ha_cfg.get("timeout", 5))
@@ -632,30 +996,29 @@ def fetch_home_assistant_humidity() -> Dict[str, Optional[float]]:
         return {}
 
     headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    results: Dict[str, Optional[float]] = {}
 
-    for _, entity in SENSOR_ENTITIES:
+    def _fetch_one(entity: str) -> Optional[float]:
         try:
             resp = ha_session.get(f"{base_url}/api/states/{entity}", headers=headers, timeout=timeout)
             if resp.status_code != 200:
-                results[entity] = None
                 append_log(
                     "error",
                     "HA state fetch failed",
                     {"entity": entity, "status": resp.status_code, "body": resp.text[:200]},
                 )
-                continue
+                return None
             payload = resp.json()
             raw = payload.get("state")
             if raw in {"unknown", "unavailable", None}:
-                results[entity] = None
-            else:
-                results[entity] = float(raw)
+                return None
+            return float(raw)
         except Exception as exc:
-            results[entity] = None
             append_log("error", f"HA fetch failed for {entity}", {"error": str(exc)})
+            return None
 
-    return results
+    # Requests are latency-bound, so fetch every sensor concurrently.
+    entities = SENSOR_IDS
+    return dict(zip(entities, _ha_pool.map(_fetch_one, entities)))
 
 
 def environment_monitor_loop() -> None:
@@ -663,7 +1026,9 @@ def environment_monitor_loop() -> None:
         humidity_map = fetch_home_assistant_humidity()
         metrics = update_metrics_from_humidity(humidity_map)
         with state_lock:
-            state["ha_humidity"] = humidity_map
+            touch_state()
+            state["ha_humidity"] = MappingProxyType(humidity_map)
+        auto_wakeup.set()
         record_history(
             {
                 "ts": datetime.utcnow().isoformat(),
@@ -674,42 +1039,40 @@ def environment_monitor_loop() -> None:
                 "max_delta": metrics.get("max_delta"),
             }
         )
-        with settings_lock:
-            poll_seconds = max(10, int(settings["ha"].get("poll_seconds", 30)))
+        poll_seconds = max(10, int(settings["ha"].get("poll_seconds", 30)))
         time.sleep(poll_seconds)
 
 
 def update_learning_offsets(entity: str, delta: float) -> None:
-    buf = auto_state["diff_buffers"].setdefault(entity, deque(maxlen=settings["learning"]["sample_window"]))
-    buf.append(delta)
+    buf = auto_state["diff_buffers"].get(entity)
+    if buf is None:
+        buf = auto_state["diff_buffers"][entity] = RollingMean(settings["learning"]["sample_window"])
+    buf.push(delta)
     if len(buf) < buf.maxlen:
         return
-    avg_delta = sum(buf) / len(buf)
+    avg_delta = buf.mean()
     rate = float(settings["learning"].get("adapt_rate", 0.05))
     max_offset = float(settings["learning"].get("max_offset", 10.0))
     adjustment = rate * avg_delta
     with state_lock:
-        offsets = state["learning"]["offsets"]
+        touch_state()
+        offsets = dict(state["learning"]["offsets"])
         new_val = offsets.get(entity, 0.0) + adjustment
         new_val = max(-max_offset, min(max_offset, new_val))
         offsets[entity] = round(new_val, 3)
+        state["learning"]["offsets"] = MappingProxyType(offsets)
         state["auto_status"]["last_learning_update"] = datetime.utcnow().isoformat()
 
 
-def determine_auto_level(humidity_map: Dict[str, Optional[float]]) -> Tuple[int, str]:
+def determine_auto_level(humidity_map: Mapping[str, Optional[float]], learn: bool = True) -> Tuple[int, str]:
     if not humidity_map:
         return 2, "No Home Assistant humidity data - staying at Level 2"
 
     deltas: List[float] = []
-    for _, entity in SENSOR_ENTITIES:
-        value = humidity_map.get(entity)
-        if value is None:
-            continue
-        target = settings["humidity_targets"].get(entity, DEFAULT_TARGET)
-        offset = state["learning"]["offsets"].get(entity, 0.0)
-        delta = value - (target + offset)
+    for entity, delta in humidity_deltas(humidity_map):
         deltas.append(delta)
-        update_learning_offsets(entity, delta)
+        if learn:
+            update_learning_offsets(entity, delta)
 
     if not deltas:
         return 2, "No valid humidity readings - holding Level 2"
@@ -735,12 +1098,22 @@ def determine_auto_level(humidity_map: Dict[str, Optional[float]]) -> Tuple[int,
     return level, reason
 
 
+AUTO_INTERVAL = 15.0
+auto_wakeup = threading.Event()
+
+
 def auto_controller_loop() -> None:
+    # Each poll publishes a new ha_humidity mapping; feed the learning buffers
+    # once per mapping so extra wake-ups (settings saves) only re-evaluate.
+    learned_map = None
     while True:
-        time.sleep(15)
+        # Run as soon as fresh humidity data or a settings change arrives,
+        # and at least every AUTO_INTERVAL seconds regardless.
+        auto_wakeup.wait(timeout=AUTO_INTERVAL)
+        auto_wakeup.clear()
         with state_lock:
             auto_enabled = state["auto_enabled"]
-            humidity_map = dict(state.get("ha_humidity", {}))
+            humidity_map = state["ha_humidity"]
             current_level = state.get("current_level")
         if not auto_enabled:
             continue
@@ -748,17 +1121,21 @@ def auto_controller_loop() -> None:
         override, remaining = manual_override_active()
         if override:
             with state_lock:
+                touch_state()
                 state["auto_status"]["last_run"] = datetime.utcnow().isoformat()
                 state["auto_status"]["recommended_level"] = None
                 state["auto_status"]["reason"] = f"Manual override active ({int(remaining)}s left)"
             continue
 
-        recommended, reason = determine_auto_level(humidity_map)
+        learn = humidity_map is not learned_map
+        learned_map = humidity_map
+        recommended, reason = determine_auto_level(humidity_map, learn=learn)
         recommended, capped = enforce_night_quiet(recommended)
         reason_suffix = " (night quiet cap)" if capped else ""
         should_change = recommended != current_level
 
         with state_lock:
+            touch_state()
             state["auto_status"]["last_run"] = datetime.utcnow().isoformat()
             state["auto_status"]["recommended_level"] = recommended
             state["auto_status"]["reason"] = reason + reason_suffix
@@ -767,15 +1144,18 @@ def auto_controller_loop() -> None:
             if recommended == 0:
                 if turn_off_all_levels():
                     with state_lock:
+                        touch_state()
                         state["auto_status"]["applied_level"] = 0
                     append_log("auto", "Auto mode turned Titon OFF", {"reason": reason + reason_suffix})
             else:
                 if apply_level_strategy(recommended):
                     with state_lock:
+                        touch_state()
                         state["auto_status"]["applied_level"] = recommended
                     append_log("auto", f"Auto mode set Level {recommended}", {"reason": reason + reason_suffix})
         else:
             with state_lock:
+                touch_state()
                 state["auto_status"]["applied_level"] = current_level
 
 
@@ -817,7 +1197,7 @@ def performance_view():
 @app.route("/settings")
 def settings_view():
     with settings_lock:
-        cfg = json.loads(json.dumps(settings))
+        cfg = readonly_settings_view()
     return render_template("settings.html", settings=cfg, sensor_entities=SENSOR_ENTITIES)
 
 
@@ -825,47 +1205,106 @@ def settings_view():
 # API routes
 # ---------------------------------------------------------------------------
 
+def json_response(obj: Any, status: int = 200):
+    return app.response_class(json_dumps_bytes(obj), status=status, mimetype="application/json")
+
+
+def request_payload() -> Dict[str, Any]:
+    """Decode the request body as a JSON object, ignoring the content type."""
+    try:
+        payload = json_loads(request.get_data(cache=False))
+    except ValueError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def _error_body(message: str, status: int) -> Tuple[bytes, int]:
+    return json_dumps_bytes({"success": False, "error": message}), status
+
+
+# Failure replies never change, so encode them once.
+_ERR_SEQUENCE_FAILED = _error_body("Command sequence failed", 500)
+_ERR_COMMAND_FAILED = _error_body("Command failed", 500)
+_ERR_BOOST_BUSY = _error_body("Boost toggle already in progress", 409)
+
+
+def error_response(error: Tuple[bytes, int]):
+    body, status = error
+    return app.response_class(body, status=status, mimetype="application/json")
+
+
+def _clamp_level(value: Any) -> int:
+    value = int(value)
+    return 1 if value < 1 else 4 if value > 4 else value
+
+
+def _clamp_humidity(value: Any) -> float:
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"humidity target must be finite, got {value!r}")
+    return 30.0 if value < 30.0 else 80.0 if value > 80.0 else value
+
+
+STATUS_CACHE_TTL = 0.5  # seconds an unchanged /api/status body is reused
+
+# (state version, monotonic expiry, encoded body)
+_status_cache: Tuple[int, float, bytes] = (-1, 0.0, b"")
+# (state version, encoded settings)
+_settings_cache: Tuple[int, bytes] = (-1, b"")
+
 
 @app.route("/api/status")
 def api_status():
-    snap = snapshot_state()
-    snap["history_samples"] = len(history_buffer)
-    snap["log_entries"] = len(log_buffer)
-    return jsonify(snap)
+    global _status_cache
+    version = _state_version
+    now = time.monotonic()
+    cached_version, expires, body = _status_cache
+    if cached_version != version or expires <= now:
+        snap = snapshot_state()
+        snap["history_samples"] = len(history_buffer)
+        snap["log_entries"] = len(log_buffer)
+        body = json_dumps_bytes(snap)
+        _status_cache = (version, now + STATUS_CACHE_TTL, body)
+    return app.response_class(body, mimetype="application/json")
 
 
 @app.route("/api/logs")
 def api_logs():
-    limit = int(request.args.get("limit", 100))
+    limit = max(0, int(request.args.get("limit", 100)))
     with log_lock:
-        data = list(log_buffer)[:limit]
-    return jsonify({"logs": data})
+        data = list(islice(log_buffer, limit))
+    return json_response({"logs": data})
 
 
 @app.route("/api/history")
 def api_history():
     limit = int(request.args.get("limit", 288))
-    data = list(history_buffer)[-limit:]
-    return jsonify({"history": data})
+    size = len(history_buffer)
+    # limit <= 0 returns the whole buffer, as the old [-limit:] slice did for 0.
+    start = size - limit if 0 < limit < size else 0
+    data = list(islice(history_buffer, start, None))
+    return json_response({"history": data})
 
 
 @app.route("/api/auto/toggle", methods=["POST"])
 def api_toggle_auto():
-    payload = request.get_json(force=True, silent=True) or {}
+    payload = request_payload()
     enabled = bool(payload.get("enabled"))
     with state_lock:
+        touch_state()
         state["auto_enabled"] = enabled
         state["mode"] = "auto" if enabled else "manual"
     with settings_lock:
         settings["auto_mode"]["enabled"] = enabled
     save_settings()
+    auto_wakeup.set()
     append_log("mode", f"Auto mode {'enabled' if enabled else 'disabled'} via UI")
-    return jsonify({"success": True, "auto_enabled": enabled})
+    return json_response({"success": True, "auto_enabled": enabled})
 
 
 @app.route("/api/night-mode", methods=["POST"])
 def api_toggle_night_mode():
-    payload = request.get_json(force=True, silent=True) or {}
+    payload = request_payload()
     enabled = payload.get("enabled")
     start = payload.get("start")
     end = payload.get("end")
@@ -880,62 +1319,77 @@ def api_toggle_night_mode():
         if isinstance(end, str):
             cfg["end"] = end
         if max_level is not None:
-            cfg["max_level"] = int(max(1, min(4, int(max_level))))
+            cfg["max_level"] = _clamp_level(max_level)
         enabled_flag = cfg["enabled"]
-    with state_lock:
+        # Single-key publish; readers of this flag never take state_lock.
         state["night_quiet_enabled"] = enabled_flag
     save_settings()
+    auto_wakeup.set()
     append_log("mode", f"Night quiet hours {'enabled' if enabled_flag else 'disabled'}")
-    return jsonify({"success": True, "night_quiet": settings["night_quiet"]})
+    return json_response({"success": True, "night_quiet": settings["night_quiet"]})
 
 
 @app.route("/api/settings", methods=["GET", "POST"])
 def api_settings():
+    global _settings_cache
     if request.method == "GET":
-        with settings_lock:
-            cfg = json.loads(json.dumps(settings))
-        return jsonify(cfg)
-
-    payload = request.get_json(force=True, silent=True) or {}
+        version = _state_version
+        cached_version, body = _settings_cache
+        if cached_version != version:
+            with settings_lock:
+                body = json_dumps_bytes(settings)
+            _settings_cache = (version, body)
+        return app.response_class(body, mimetype="application/json")
+
+    payload = request_payload()
+    incoming = payload.get("humidity_targets") or {}
     with settings_lock:
+        targets = settings["humidity_targets"]
         for entity in SENSOR_IDS:
+            value = incoming.get(entity)
+            if value is None:
+                continue
             try:
-                target = float(payload.get("humidity_targets", {}).get(entity, settings["humidity_targets"][entity]))
-                settings["humidity_targets"][entity] = max(30.0, min(80.0, target))
+                targets[entity] = _clamp_humidity(value)
             except (TypeError, ValueError):
                 continue
-        if "ha" in payload:
-            settings["ha"]["url"] = payload["ha"].get("url", settings["ha"]["url"])
-            token = payload["ha"].get("token")
+        ha_in = payload.get("ha")
+        if ha_in:
+            ha_cfg = settings["ha"]
+            ha_cfg["url"] = ha_in.get("url", ha_cfg["url"])
+            token = ha_in.get("token")
             if token is not None:
-                settings["ha"]["token"] = token
-            if "poll_seconds" in payload["ha"]:
-                settings["ha"]["poll_seconds"] = max(10, int(payload["ha"]["poll_seconds"]))
-        if "auto_mode" in payload:
-            override = payload["auto_mode"].get("override_minutes")
+                ha_cfg["token"] = token
+            poll = ha_in.get("poll_seconds")
+            if poll is not None:
+                ha_cfg["poll_seconds"] = max(10, int(poll))
+        auto_in = payload.get("auto_mode")
+        if auto_in:
+            auto_cfg = settings["auto_mode"]
+            override = auto_in.get("override_minutes")
             if override is not None:
-                settings["auto_mode"]["override_minutes"] = max(1, int(override))
-            aggressive = payload["auto_mode"].get("aggressiveness")
+                auto_cfg["override_minutes"] = max(1, int(override))
+            aggressive = auto_in.get("aggressiveness")
             if aggressive:
-                settings["auto_mode"]["aggressiveness"] = aggressive
-        if "night_quiet" in payload:
-            settings["night_quiet"]["start"] = payload["night_quiet"].get("start", settings["night_quiet"]["start"])
-            settings["night_quiet"]["end"] = payload["night_quiet"].get("end", settings["night_quiet"]["end"])
-            settings["night_quiet"]["max_level"] = int(
-                max(1, min(4, int(payload["night_quiet"].get("max_level", settings["night_quiet"]["max_level"]))))
-            )
-            settings["night_quiet"]["enabled"] = bool(payload["night_quiet"].get("enabled", settings["night_quiet"]["enabled"]))
+                auto_cfg["aggressiveness"] = aggressive
+        night_in = payload.get("night_quiet")
+        if night_in:
+            night_cfg = settings["night_quiet"]
+            night_cfg["start"] = night_in.get("start", night_cfg["start"])
+            night_cfg["end"] = night_in.get("end", night_cfg["end"])
+            night_cfg["max_level"] = _clamp_level(night_in.get("max_level", night_cfg["max_level"]))
+            night_cfg["enabled"] = bool(night_in.get("enabled", night_cfg["enabled"]))
+            state["night_quiet_enabled"] = night_cfg["enabled"]
         save_settings()
 
+    auto_wakeup.set()
     append_log("settings", "Settings updated", {"payload": payload})
-    return jsonify({"success": True})
+    return json_response({"success": True})
 
 
-@app.route("/api/level/<int:level>", methods=["POST"])
+# Levels outside 1-4 are rejected by the URL converter with a 404.
+@app.route("/api/level/<int(min=1, max=4):level>", methods=["POST"], provide_automatic_options=False)
 def api_set_level(level: int):
-    if level not in (1, 2, 3, 4):
-        return jsonify({"success": False, "error": "Invalid level"}), 400
-
     level, capped = enforce_night_quiet(level)
     if capped:
         append_log("mode", f"Requested level capped due to quiet hours", {"capped_level": level})
@@ -943,33 +1397,45 @@ def api_set_level(level: int):
     success = apply_level_strategy(level)
     if success:
         schedule_manual_override()
-        return jsonify({"success": True, "level": level})
+        return json_response({"success": True, "level": level})
 
-    return jsonify({"success": False, "error": "Command sequence failed"}), 500
+    return error_response(_ERR_SEQUENCE_FAILED)
 
 
-@app.route("/api/off", methods=["POST"])
+@app.route("/api/off", methods=["POST"], provide_automatic_options=False)
 def api_turn_off():
     if turn_off_all_levels():
         schedule_manual_override()
-        return jsonify({"success": True})
-    return jsonify({"success": False, "error": "Command sequence failed"}), 500
+        return json_response({"success": True})
+    return error_response(_ERR_SEQUENCE_FAILED)
+
 
+# Serialises boost toggles so two clicks cannot both act on the same old state.
+_boost_toggle_lock = threading.Lock()
 
-@app.route("/api/boost", methods=["POST"])
+
+@app.route("/api/boost", methods=["POST"], provide_automatic_options=False)
 def api_toggle_boost():
-    with state_lock:
+    if not _boost_toggle_lock.acquire(blocking=False):
+        return error_response(_ERR_BOOST_BUSY)
+    try:
         new_state = not state["boost_active"]
-    success = send_command("154", 1 if new_state else 0)
+        success = send_command("154", 1 if new_state else 0)
+        if success:
+            started = utc_timestamp() if new_state else None
+            with state_lock:
+                touch_state()
+                state["boost_active"] = new_state
+                if new_state:
+                    state["current_level"] = 4
+                    state["level_start_time"] = started
+    finally:
+        _boost_toggle_lock.release()
     if success:
-        with state_lock:
-            state["boost_active"] = new_state
-            state["current_level"] = 4 if new_state else state["current_level"]
-            state["level_start_time"] = datetime.utcnow().isoformat() if new_state else state["level_start_time"]
         schedule_manual_override()
         append_log("control", f"Boost {'ON' if new_state else 'OFF'}", {})
-        return jsonify({"success": True, "state": "ON" if new_state else "OFF"})
-    return jsonify({"success": False, "error": "Command failed"}), 500
+        return json_response({"success": True, "state": "ON" if new_state else "OFF"})
+    return error_response(_ERR_COMMAND_FAILED)
 
 
 # ---------------------------------------------------------------------------
@@ -977,15 +1443,23 @@ def api_toggle_boost():
 # ---------------------------------------------------------------------------
 
 
+BACKGROUND_LOOPS = (
+    update_sensors_loop,
+    environment_monitor_loop,
+    auto_controller_loop,
+    log_flush_loop,
+    settings_flush_loop,
+)
+
+
 def start_background_threads() -> None:
     global _threads_started
     with _threads_lock:
         if _threads_started:
             return
         _threads_started = True
-    threading.Thread(target=update_sensors_loop, daemon=True).start()
-    threading.Thread(target=environment_monitor_loop, daemon=True).start()
-    threading.Thread(target=auto_controller_loop, daemon=True).start()
+    for loop in BACKGROUND_LOOPS:
+        threading.Thread(target=loop, name=f"titon-{loop.__name__}", daemon=True).start()
 
 
 def ensure_runtime_started() -> None:
@@ -998,12 +1472,26 @@ def ensure_runtime_started() -> None:
         _runtime_started = True
 
 
-def create_server(host: str = "0.0.0.0", port: int = 8050):
+def create_server(
+    host: str = "0.0.0.0",
+    port: int = 8050,
+    *,
+    serial_port: Optional[str] = None,
+    settings_path: Optional[str] = None,
+    log_path: Optional[str] = None,
+    sensors: Optional[List[Any]] = None,
+):
     from werkzeug.serving import make_server
 
+    configure_runtime(
+        serial_port=serial_port,
+        settings_path=settings_path,
+        log_path=log_path,
+        sensors=sensors,
+    )
     ensure_runtime_started()
     try:
-        server = make_server(host, port, app)
+        server = make_server(host, port, app, threaded=True)
     except OSError as exc:
         raise RuntimeError(f"Failed to bind Titon WebUI on {host}:{port}: {exc}") from exc
     except SystemExit as exc:
@@ -1018,6 +1506,9 @@ def shutdown_server(server) -> None:
         server.shutdown()
     except Exception:
         pass
+    close_serial_port()
+    flush_settings()
+    flush_logs()
 
 
 if __name__ == "__main__":
@@ -1037,4 +1528,4 @@ if __name__ == "__main__":
     print(f"✅ Starting WebUI on http://{WEB_HOST}:{WEB_PORT}")
     print("=" * 70)
 
-    app.run(host=WEB_HOST, port=WEB_PORT, debug=False, use_reloader=False)
+    app.run(host=WEB_HOST, port=WEB_PORT, debug=False, use_reloader=False, threaded=True)